@@ -3,11 +3,19 @@ from flask import Flask
 from flask_cors import CORS
 from elasticsearch import Elasticsearch
 import os
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Edge n-gram subfield used for search-as-you-type prefix matching
+PREFIX_FIELD = {
+    "type": "text",
+    "analyzer": "prefix_index",
+    "search_analyzer": "prefix_search"
+}
+
 def create_app():
     """Create and configure the Flask application."""
     app = Flask(__name__)
@@ -24,21 +32,57 @@ def create_app():
     )
 
     # Register blueprints
-    from .routes import items_bp
+    from .routes import items_bp, init_routes
     app.register_blueprint(items_bp)
+    init_routes(app)
+
+    # Compress responses for clients that accept it
+    from .middleware.compression import compress_response
+    app.after_request(compress_response)
 
     # Create index if it doesn't exist
     index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
     if not app.elasticsearch.indices.exists(index=index_name):
         app.elasticsearch.indices.create(
             index=index_name,
+            settings={
+                "analysis": {
+                    "filter": {
+                        "prefix_filter": {
+                            "type": "edge_ngram",
+                            "min_gram": 2,
+                            "max_gram": 20
+                        }
+                    },
+                    "analyzer": {
+                        # Index every word prefix so prefix queries are plain term lookups
+                        "prefix_index": {
+                            "type": "custom",
+                            "tokenizer": "standard",
+                            "filter": ["lowercase", "asciifolding", "prefix_filter"]
+                        },
+                        "prefix_search": {
+                            "type": "custom",
+                            "tokenizer": "standard",
+                            "filter": ["lowercase", "asciifolding"]
+                        }
+                    }
+                }
+            },
             mappings={
                 "properties": {
                     "id": {"type": "keyword"},
-                    "name": {"type": "text"},
+                    "name": {
+                        "type": "text",
+                        "fields": {"prefix": PREFIX_FIELD}
+                    },
                     "description": {"type": "text"},
-                    "tags": {"type": "keyword"},
-                    "suggest_input": {"type": "completion"},
+                    # Eager global ordinals are rebuilt on refresh instead of on the first aggregation
+                    "tags": {"type": "keyword", "eager_global_ordinals": True},
+                    "suggest_input": {
+                        "type": "completion",
+                        "fields": {"prefix": PREFIX_FIELD}
+                    },
                     "metadata": {
                         "type": "object",
                         "dynamic": True
@@ -47,4 +91,17 @@ def create_app():
             }
         )
 
+    # Warm caches before reporting ready, in the background so the worker can answer probes
+    from .warmup import warm_up
+    app.warmed_up = threading.Event()
+    if os.getenv('WARMUP_ON_STARTUP', 'false').lower() == 'true':
+        threading.Thread(target=warm_up, args=(app,), daemon=True).start()
+    else:
+        app.warmed_up.set()
+
+    @app.cli.command('warmup')
+    def warmup_command():
+        """Warm Elasticsearch caches by replaying the most frequent captured queries."""
+        warm_up(app)
+
     return app
@@ -1,14 +1,97 @@
-from flask import jsonify, request, current_app
+from flask import Response, jsonify, request, current_app
 from elasticsearch import NotFoundError
+import hashlib
+import json
 import os
+import re
 import time
 
+# Routing key for items whose address has no zipcode
+UNKNOWN_REGION = '000'
+
+def _results_etag(body):
+    """Content hash of a results body, ignoring the per-request timing."""
+    meta = {key: value for key, value in body['meta'].items() if key != 'time_ms'}
+    content = json.dumps({"items": body['items'], "meta": meta}, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def _routing_enabled():
+    return os.getenv('ROUTING_BY_REGION', 'false').lower() == 'true'
+
+def _item_routing(data):
+    """Routing key for an item: the 3-digit region of the zipcode in its address."""
+    address = data.get('address') or (data.get('metadata') or {}).get('address') or ''
+    match = re.search(r'\b(\d{5})\b', str(address))
+    return match.group(1)[:3] if match else UNKNOWN_REGION
+
+def _search_routing(zipcode):
+    """
+    Routing value for a search near `zipcode`.
+
+    Covers the zipcode's region, `ROUTING_NEIGHBOR_REGIONS` regions on each
+    side and the region of items without a zipcode, so those stay searchable.
+    None (search every shard) if routing is disabled or the zipcode is not a
+    5-digit zipcode.
+    """
+    zipcode = zipcode.strip()
+    if not _routing_enabled() or not re.fullmatch(r'\d{5}', zipcode):
+        return None
+    neighbors = int(os.getenv('ROUTING_NEIGHBOR_REGIONS', 1))
+    center = int(zipcode[:3])
+    regions = [
+        f"{center + offset:03d}"
+        for offset in range(-neighbors, neighbors + 1)
+        if 0 <= center + offset <= 999
+    ]
+    if UNKNOWN_REGION not in regions:
+        regions.append(UNKNOWN_REGION)
+    return ','.join(regions)
+
+def _find_item(es, index_name, item_id):
+    """
+    Fetch an item without knowing its routing key.
+
+    An ids search finds the routing keys the item is stored under; it visits
+    every shard but only touches one document per shard. Searches are only
+    near-real-time, so the item itself is then read with a real-time get on
+    each candidate routing, skipping copies that are already deleted.
+
+    Returns:
+        tuple: The item's routing key and get response, or None if not found
+    """
+    result = es.search(
+        index=index_name,
+        query={"ids": {"values": [item_id]}},
+        size=10,
+        source=False
+    )
+    for hit in result['hits']['hits']:
+        routing = hit.get('_routing')
+        try:
+            return routing, es.get(index=index_name, id=item_id, routing=routing)
+        except NotFoundError:
+            continue
+    return None
+
 def get_item(id):
     """Get a single item by its ID."""
     try:
         es = current_app.elasticsearch
-        result = es.get(index=os.getenv('ELASTICSEARCH_INDEX', 'items'), id=str(id))
-        return jsonify(result['_source']), 200
+        index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
+        routing = None
+        if _routing_enabled():
+            found = _find_item(es, index_name, str(id))
+            if found is None:
+                return jsonify({"error": "Item not found"}), 404
+            routing, result = found
+        else:
+            result = es.get(index=index_name, id=str(id))
+        response = jsonify(result['_source'])
+        # Every write bumps _seq_no, so together with _primary_term it identifies this version.
+        # _seq_no is counted per shard, so routed items also include the shard's routing key.
+        version = f"{result['_primary_term']}-{result['_seq_no']}"
+        response.set_etag(f"{routing}-{version}" if routing else version, weak=True)
+        return response, 200
     except NotFoundError:
         return jsonify({"error": "Item not found"}), 404
     except Exception as e:
@@ -39,10 +122,23 @@ def create_or_update_item():
         data['id'] = item_id
 
         es = current_app.elasticsearch
+        index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
+        routing = None
+        if _routing_enabled():
+            routing = _item_routing(data)
+            # An item that moved region lives on another shard; remove the old copy
+            previous = _find_item(es, index_name, item_id)
+            if previous is not None and previous[0] != routing:
+                try:
+                    es.delete(index=index_name, id=item_id, routing=previous[0], refresh=True)
+                except NotFoundError:
+                    pass  # Already removed by a concurrent update
+
         result = es.index(
-            index=os.getenv('ELASTICSEARCH_INDEX', 'items'),
+            index=index_name,
             id=item_id,
             document=data,
+            routing=routing,
             refresh=True  # Make the document immediately searchable
         )
 
@@ -65,18 +161,91 @@ def delete_item(item_id):
     """Delete an item from Elasticsearch by its ID."""
     try:
         es = current_app.elasticsearch
+        index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
+        routing = None
         # First check if the item exists
-        if not es.exists(index=os.getenv('ELASTICSEARCH_INDEX', 'items'), id=str(item_id)):
+        if _routing_enabled():
+            previous = _find_item(es, index_name, str(item_id))
+            if previous is None:
+                return jsonify({"error": "can't find item"}), 404
+            routing = previous[0]
+        elif not es.exists(index=index_name, id=str(item_id)):
             return jsonify({"error": "can't find item"}), 404
             
-        response = es.delete(index=os.getenv('ELASTICSEARCH_INDEX', 'items'), id=str(item_id))
+        response = es.delete(
+            index=index_name,
+            id=str(item_id),
+            routing=routing,
+            refresh=True  # Hide the item from searches, and so from routing lookups, right away
+        )
         if response.get('result') == 'deleted':
             return jsonify({"message": "Item successfully deleted", "id": str(item_id)}), 200
         
+    except NotFoundError:
+        # Deleted by a concurrent request since the lookup
+        return jsonify({"error": "can't find item"}), 404
     except Exception as e:
         current_app.logger.error(f"Error deleting item: {str(e)}")
         return jsonify({"error": "Failed to delete item"}), 500
 
+def export_items():
+    """
+    Stream every item in the index as NDJSON.
+
+    Pages through the index with a point-in-time and `search_after`, so memory
+    use stays constant regardless of the index size. The point-in-time is
+    closed once the stream finishes or the client disconnects.
+
+    Returns:
+        Streamed application/x-ndjson response, one item `_source` per line
+        500 error if the export cannot be started
+    """
+    try:
+        es = current_app.elasticsearch
+        logger = current_app.logger
+        index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
+        batch_size = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+        keep_alive = os.getenv('EXPORT_KEEP_ALIVE', '1m')
+        pit_id = es.open_point_in_time(index=index_name, keep_alive=keep_alive)['id']
+    except Exception as e:
+        current_app.logger.error(f"Error starting export: {str(e)}")
+        return jsonify({"error": "Failed to export items"}), 500
+
+    def generate():
+        nonlocal pit_id
+        search_after = None
+        try:
+            while True:
+                page = {
+                    "size": batch_size,
+                    "pit": {"id": pit_id, "keep_alive": keep_alive},
+                    # _shard_doc is the cheapest tiebreaker for paging a point-in-time
+                    "sort": [{"_shard_doc": "asc"}],
+                    "track_total_hits": False
+                }
+                if search_after is not None:
+                    page["search_after"] = search_after
+
+                result = es.search(**page)
+                pit_id = result.get('pit_id', pit_id)
+                hits = result['hits']['hits']
+                for hit in hits:
+                    yield json.dumps(hit['_source']) + '\n'
+
+                if len(hits) < batch_size:
+                    break
+                search_after = hits[-1]['sort']
+        except Exception as e:
+            # Headers are already sent, so the best we can do is end the stream early
+            logger.error(f"Error exporting items: {str(e)}")
+        finally:
+            try:
+                es.close_point_in_time(id=pit_id)
+            except Exception as e:
+                logger.error(f"Error closing point in time: {str(e)}")
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
 def search_items(query=None, zipcode=None, size=20):
     """
     Search for items using a multi-field query and sort by distance to zipcode.
@@ -85,7 +254,8 @@ def search_items(query=None, zipcode=None, size=20):
     2. Exact name matches
     3. Partial description matches
     4. Tags and suggest_input matches
-    5. Fuzzy name matches
+    5. Prefix matches on name and suggest_input, or fuzzy name matches
+       when prefixes alone find fewer than FUZZY_FALLBACK_MIN_HITS items
     
     Args:
         query (str): The search query (required)
@@ -110,11 +280,30 @@ def search_items(query=None, zipcode=None, size=20):
                 "detail": "Zipcode parameter is required"
             }), 400
 
-        print(f"Searching for items with query: {query}, zipcode: {zipcode}, size: {size}")
+        current_app.logger.debug(f"Searching for items with query: {query}, zipcode: {zipcode}, size: {size}")
         start_time = time.time()
         es = current_app.elasticsearch
         index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
         
+        # Text conditions; prefix matching uses the edge n-gram subfields built at index time
+        should = [
+            # Priority 2: Exact name matches (highest text relevance)
+            {"match_phrase": {"name": {"query": query, "boost": 15}}},
+            # Priority 3: Partial description matches
+            {"match": {"description": {
+                "query": query,
+                "boost": 8,
+                "operator": "and",  # All terms should match for higher precision
+                "minimum_should_match": "60%"  # But allow some terms to be missing
+            }}},
+            # Priority 4: Tags and suggest_input
+            {"match": {"tags": {"query": query, "boost": 4}}},
+            {"match": {"suggest_input": {"query": query, "boost": 4}}},
+            # Priority 5: Prefix matches on what has been typed so far
+            {"match": {"name.prefix": {"query": query, "operator": "and", "boost": 2}}},
+            {"match": {"suggest_input.prefix": {"query": query, "operator": "and", "boost": 2}}}
+        ]
+
         # Build the query with all search conditions
         search_body = {
             "size": size,
@@ -124,27 +313,7 @@ def search_items(query=None, zipcode=None, size=20):
                 "function_score": {
                     "query": {
                         "bool": {
-                            "should": [
-                                # Priority 2: Exact name matches (highest text relevance)
-                                {"match_phrase": {"name": {"query": query, "boost": 15}}},
-                                # Priority 3: Partial description matches
-                                {"match": {"description": {
-                                    "query": query,
-                                    "boost": 8,
-                                    "operator": "and",  # All terms should match for higher precision
-                                    "minimum_should_match": "60%"  # But allow some terms to be missing
-                                }}},
-                                # Priority 4: Tags and suggest_input
-                                {"match": {"tags": {"query": query, "boost": 4}}},
-                                {"match": {"suggest_input": {"query": query, "boost": 4}}},
-                                # Priority 5: Fuzzy name matches (lowest priority for text)
-                                {"match": {"name": {
-                                    "query": query,
-                                    "fuzziness": "AUTO",
-                                    "boost": 2,
-                                    "prefix_length": 2  # Require first 2 chars to match to reduce noise
-                                }}}
-                            ],
+                            "should": should,
                             "minimum_should_match": 1
                         }
                     },
@@ -183,8 +352,19 @@ def search_items(query=None, zipcode=None, size=20):
             }
         }
 
-        # Execute search
-        result = es.search(index=index_name, body=search_body)
+        # Execute search, only on the shards holding the zipcode's region and its neighbors
+        routing = _search_routing(zipcode)
+        result = es.search(index=index_name, body=search_body, routing=routing)
+
+        # Fuzzy expansion is expensive, so only pay for it when prefixes found too little
+        if result['hits']['total']['value'] < min(size, int(os.getenv('FUZZY_FALLBACK_MIN_HITS', 3))):
+            should.append({"match": {"name": {
+                "query": query,
+                "fuzziness": "AUTO",
+                "boost": 2,
+                "prefix_length": 2  # Require first 2 chars to match to reduce noise
+            }}})
+            result = es.search(index=index_name, body=search_body, routing=routing)
         
         # Process results
         hits = result['hits']['hits']
@@ -193,7 +373,7 @@ def search_items(query=None, zipcode=None, size=20):
             '_score': hit['_score']
         } for hit in hits]
 
-        return jsonify({
+        body = {
             "items": items,
             "meta": {
                 "total": result['hits']['total']['value'],
@@ -202,7 +382,10 @@ def search_items(query=None, zipcode=None, size=20):
                 "query": query,
                 "zipcode": zipcode
             }
-        }), 200
+        }
+        response = jsonify(body)
+        response.set_etag(_results_etag(body), weak=True)
+        return response, 200
         
     except Exception as e:
         current_app.logger.error(f"Error searching items: {str(e)}")
@@ -211,3 +394,77 @@ def search_items(query=None, zipcode=None, size=20):
             "detail": str(e)
         }), 500
     
+
+def suggest_items(query=None, zipcode=None, size=10):
+    """
+    Cheap prefix suggestions from the `suggest_input` completion field.
+
+    Used as a fallback when the full search is at its concurrency limit. It
+    skips the scoring script, so results are not ordered by distance.
+
+    Args:
+        query (str): The search prefix (required)
+        zipcode (str): The zipcode of the request, echoed back in the metadata (required)
+        size (int): Maximum number of results to return
+
+    Returns:
+        JSON response in the same shape as search_items, with `meta.degraded` set
+        400 error if required parameters are missing
+    """
+    try:
+        if not query or not query.strip():
+            return jsonify({
+                "error": "Bad Request",
+                "detail": "Query parameter is required"
+            }), 400
+
+        if not zipcode or not zipcode.strip():
+            return jsonify({
+                "error": "Bad Request",
+                "detail": "Zipcode parameter is required"
+            }), 400
+
+        start_time = time.time()
+        es = current_app.elasticsearch
+        result = es.search(
+            index=os.getenv('ELASTICSEARCH_INDEX', 'items'),
+            routing=_search_routing(zipcode),
+            suggest={
+                "items": {
+                    "prefix": query,
+                    "completion": {
+                        "field": "suggest_input",
+                        "size": size,
+                        "skip_duplicates": True
+                    }
+                }
+            }
+        )
+
+        options = result['suggest']['items'][0]['options']
+        items = [{
+            **option['_source'],
+            '_score': option['_score']
+        } for option in options]
+
+        body = {
+            "items": items,
+            "meta": {
+                "total": len(items),
+                "count": len(items),
+                "time_ms": round((time.time() - start_time) * 1000),
+                "query": query,
+                "zipcode": zipcode,
+                "degraded": True
+            }
+        }
+        response = jsonify(body)
+        response.set_etag(_results_etag(body), weak=True)
+        return response, 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error suggesting items: {str(e)}")
+        return jsonify({
+            "error": "Failed to search items",
+            "detail": str(e)
+        }), 500
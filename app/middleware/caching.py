@@ -0,0 +1,29 @@
+from functools import wraps
+from flask import request, make_response
+import os
+
+def conditional_response(setting, default='no-cache'):
+    """
+    Decorator that adds HTTP cache validators to successful responses.
+
+    Sets `Cache-Control` from the `setting` environment variable and answers
+    `If-None-Match` with a bodiless 304 when the ETag set by the controller
+    still matches. Responses vary on the API token so shared caches never serve
+    one client's response to another.
+
+    Args:
+        setting (str): Environment variable holding the Cache-Control value
+        default (str): Cache-Control value used when the variable is unset
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            response.headers['Cache-Control'] = os.getenv(setting, default)
+            response.vary.add('X-API-Token')
+            return response.make_conditional(request)
+        return decorated_function
+    return decorator
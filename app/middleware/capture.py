@@ -0,0 +1,84 @@
+from functools import wraps
+from flask import request, make_response
+from logging.handlers import RotatingFileHandler
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+_lock = threading.Lock()
+_capture_logger = None
+
+def _get_capture_logger():
+    """Logger that writes captured requests to a rotating file, or None if capture is off."""
+    global _capture_logger
+    path = os.getenv('QUERY_CAPTURE_FILE')
+    if not path:
+        return None
+    with _lock:
+        if _capture_logger is None:
+            # Rotation is not safe across processes, so each worker writes its own file
+            handler = RotatingFileHandler(
+                path.format(pid=os.getpid()),
+                maxBytes=int(os.getenv('QUERY_CAPTURE_MAX_BYTES', 10 * 1024 * 1024)),
+                backupCount=int(os.getenv('QUERY_CAPTURE_BACKUP_COUNT', 5))
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger = logging.getLogger('flasksearch.capture')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _capture_logger = logger
+        return _capture_logger
+
+def reset_capture():
+    """Close the capture file so changed settings are picked up (used by tests)."""
+    global _capture_logger
+    with _lock:
+        if _capture_logger is not None:
+            for handler in list(_capture_logger.handlers):
+                _capture_logger.removeHandler(handler)
+                handler.close()
+        _capture_logger = None
+
+def normalize_params(args):
+    """Normalize request parameters so equivalent queries are recorded the same way."""
+    params = {key: value.strip() for key, value in args.items()}
+    if 'query' in params:
+        params['query'] = ' '.join(params['query'].split()).lower()
+    return params
+
+def capture_queries(route):
+    """
+    Decorator that records a sample of requests for later replay.
+
+    Off unless `QUERY_CAPTURE_FILE` is set. A `QUERY_CAPTURE_SAMPLE_RATE`
+    fraction of requests (default 0.1) is written as one JSON line with the
+    normalized parameters, status and handling time. `{pid}` in the file name
+    is replaced by the worker's process id.
+
+    Args:
+        route (str): Name stored with each record to group the replayed requests
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            logger = _get_capture_logger()
+            if logger is None or random.random() >= float(os.getenv('QUERY_CAPTURE_SAMPLE_RATE', 0.1)):
+                return f(*args, **kwargs)
+
+            start_time = time.time()
+            response = make_response(f(*args, **kwargs))
+            logger.info(json.dumps({
+                "ts": start_time,
+                "route": route,
+                "path": request.path,
+                "params": normalize_params(request.args),
+                "status": response.status_code,
+                "time_ms": round((time.time() - start_time) * 1000, 2)
+            }))
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,66 @@
+from flask import request
+import gzip
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+def _choose_encoding():
+    """Pick the best encoding the client accepts, or None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted.quality('br') > 0:
+        return 'br'
+    if accepted.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+def _compress_stream(chunks, encoding):
+    """Compress an iterable of chunks incrementally so streamed bodies stay streamed."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=4)
+        for chunk in chunks:
+            data = compressor.process(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+def compress_response(response):
+    """
+    after_request hook that compresses responses with gzip or brotli.
+
+    Buffered responses are compressed when they are at least
+    `COMPRESSION_MIN_SIZE` bytes; streamed responses are always compressed
+    chunk by chunk.
+    """
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < int(os.getenv('COMPRESSION_MIN_SIZE', 1024)):
+            return response
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=4))
+        else:
+            response.set_data(gzip.compress(data, compresslevel=6))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
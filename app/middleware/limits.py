@@ -0,0 +1,140 @@
+from functools import wraps
+from flask import Response, request, jsonify
+import math
+import os
+import threading
+import time
+
+class TokenBucket:
+    """Token-bucket rate limiter refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, tokens=1):
+        """
+        Try to take tokens from the bucket.
+
+        Returns:
+            float: 0.0 if the tokens were taken, otherwise the number of seconds
+            until enough tokens will be available
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+# Limiter state is per worker process; it is created lazily on first use of a route
+_lock = threading.Lock()
+_semaphores = {}
+_buckets = {}
+
+def _route_setting(name, route, default):
+    """Read a numeric setting, preferring the route-specific `NAME_ROUTE` variable."""
+    value = os.getenv(f"{name}_{route.upper()}", os.getenv(name, default))
+    return float(value)
+
+def _get_semaphore(route):
+    with _lock:
+        if route not in _semaphores:
+            limit = int(_route_setting('MAX_CONCURRENT_BACKEND_CALLS', route, 16))
+            _semaphores[route] = threading.BoundedSemaphore(limit) if limit > 0 else None
+        return _semaphores[route]
+
+def _get_bucket(route, api_token):
+    key = (route, api_token)
+    with _lock:
+        if key not in _buckets:
+            rate = _route_setting('RATE_LIMIT_PER_SECOND', route, 0)
+            burst = _route_setting('RATE_LIMIT_BURST', route, max(rate, 1))
+            _buckets[key] = TokenBucket(rate, burst) if rate > 0 else None
+        return _buckets[key]
+
+def reset_limits():
+    """Drop all limiter state so changed settings are picked up (used by tests)."""
+    with _lock:
+        _semaphores.clear()
+        _buckets.clear()
+
+def _reject(status, error, detail, retry_after):
+    response = jsonify({"error": error, "detail": detail})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+def _call_with_slot(route, f, args, kwargs):
+    """
+    Call `f` while holding one of the route's concurrency slots.
+
+    For a streamed response the slot is held until the response is closed,
+    i.e. until the body has been sent or the client has gone away.
+
+    Returns:
+        The view's return value, or None if no slot freed up in time
+    """
+    semaphore = _get_semaphore(route)
+    if semaphore is None:
+        return f(*args, **kwargs)
+
+    timeout = _route_setting('ADMISSION_QUEUE_TIMEOUT', route, 0.05)
+    if not semaphore.acquire(timeout=timeout):
+        return None
+    held_by_stream = False
+    try:
+        response = f(*args, **kwargs)
+        if isinstance(response, Response) and response.is_streamed:
+            # A streamed body keeps querying the backend, so hold the slot until it is closed
+            response.call_on_close(semaphore.release)
+            held_by_stream = True
+        return response
+    finally:
+        if not held_by_stream:
+            semaphore.release()
+
+def admission_control(route, fallback=None):
+    """
+    Decorator that limits how much backend work a route may start.
+
+    Each API token gets a token bucket per route (`RATE_LIMIT_PER_SECOND`,
+    `RATE_LIMIT_BURST`); requests over the rate are rejected with 429. The
+    rate is configured per route only, and with the single `API_TOKEN` every
+    client shares one bucket per route. Each
+    route also gets a concurrency limit (`MAX_CONCURRENT_BACKEND_CALLS`) with a
+    short wait (`ADMISSION_QUEUE_TIMEOUT`) for a free slot. When no slot frees
+    up the request is served by `fallback` if given, otherwise rejected with 503.
+    The fallback still reaches the backend, so it has its own concurrency limit
+    under the route name `<route>_fallback`; when that is full too the request
+    is rejected with 503. Every setting can be overridden per route by suffixing
+    the route name, e.g. `MAX_CONCURRENT_BACKEND_CALLS_SUGGESTIONS_FALLBACK`.
+
+    Args:
+        route (str): Name used to key the limits and their settings
+        fallback (callable): Cheaper view to call with the same arguments when
+            the route is at its concurrency limit
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            bucket = _get_bucket(route, request.headers.get('X-API-Token'))
+            if bucket is not None:
+                wait = bucket.consume()
+                if wait:
+                    return _reject(429, "Too Many Requests", "Rate limit exceeded", wait)
+
+            response = _call_with_slot(route, f, args, kwargs)
+            if response is None and fallback is not None:
+                response = _call_with_slot(f"{route}_fallback", fallback, args, kwargs)
+            if response is None:
+                retry_after = _route_setting('ADMISSION_RETRY_AFTER', route, 1)
+                return _reject(503, "Service Unavailable", "Search backend is at capacity", retry_after)
+            return response
+        return decorated_function
+    return decorator
@@ -1,8 +1,11 @@
 # app/routes.py
 from urllib import request
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from .middleware.auth import require_api_token
-from .controllers.items import get_item, create_or_update_item, delete_item, search_items
+from .middleware.limits import admission_control
+from .middleware.caching import conditional_response
+from .middleware.capture import capture_queries
+from .controllers.items import get_item, create_or_update_item, delete_item, search_items, suggest_items, export_items
 
 # Create blueprint for items API
 items_bp = Blueprint('items', __name__)
@@ -10,22 +13,40 @@ items_bp = Blueprint('items', __name__)
 # Item routes
 @items_bp.route('/api/v1/items/<string:id>', methods=['GET'])
 @require_api_token
+@capture_queries('items')
+@conditional_response('ITEM_CACHE_CONTROL')
+@admission_control('items')
 def get_item_by_id(id):
     return get_item(id)
 
+@items_bp.route('/api/v1/items/_export', methods=['GET'])
+@require_api_token
+@admission_control('export')
+def export_items_route():
+    return export_items()
+
 @items_bp.route('/api/v1/items', methods=['PUT'])
 @require_api_token
+@admission_control('items')
 def update_item():
     return create_or_update_item()
 
 @items_bp.route('/api/v1/items/<id>', methods=['DELETE'])
 @require_api_token
+@admission_control('items')
 def delete_item_route(id):
     return delete_item(id)
 
+# Cheaper completion-based suggestions, served when the full search is at capacity
+def get_fallback_suggestions():
+    return suggest_items(request.args.get('query'), request.args.get('zipcode'), 10)
+
 # Suggestions endpoint for autocomplete
 @items_bp.route('/api/v1/suggestions', methods=['GET'])
 @require_api_token
+@capture_queries('suggestions')
+@conditional_response('SUGGESTIONS_CACHE_CONTROL')
+@admission_control('suggestions', fallback=get_fallback_suggestions)
 def get_suggestions():
     # Get query from URL parameters
     query = request.args.get('query')
@@ -45,4 +66,11 @@ def get_suggestions():
 def init_routes(app):
     @app.route('/api/status', methods=['GET'])
     def status():
-        return jsonify({"status": "Search service is running"}), 200
\ No newline at end of file
+        return jsonify({"status": "Search service is running"}), 200
+
+    # Readiness route; not ready until the startup warm-up has finished
+    @app.route('/api/ready', methods=['GET'])
+    def ready():
+        if not current_app.warmed_up.is_set():
+            return jsonify({"status": "Warming up"}), 503
+        return jsonify({"status": "Ready"}), 200
\ No newline at end of file
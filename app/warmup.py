@@ -0,0 +1,95 @@
+from collections import Counter
+from .controllers.items import get_item, search_items
+import glob
+import json
+import os
+import time
+
+def top_captured_requests(limit):
+    """
+    The most frequent requests in the query capture files.
+
+    Reads every worker's capture file, including rotated ones, so the result
+    reflects recent traffic as far back as the capture retention goes.
+
+    Returns:
+        list: (route, path, params) tuples, most frequent first
+    """
+    path = os.getenv('QUERY_CAPTURE_FILE')
+    if not path:
+        return []
+
+    counts = Counter()
+    for capture_file in glob.glob(path.format(pid='*') + '*'):
+        try:
+            with open(capture_file, 'r') as f:
+                lines = f.readlines()
+        except OSError:
+            # Another worker may have rotated the file away since the glob
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            # Skip lines that parse as JSON but are not capture records
+            if not isinstance(record, dict) or record.get('status') != 200:
+                continue
+            route, path, params = record.get('route'), record.get('path'), record.get('params')
+            if isinstance(route, str) and isinstance(path, str) and isinstance(params, dict):
+                counts[(route, path, json.dumps(params, sort_keys=True))] += 1
+
+    return [
+        (route, path, json.loads(params))
+        for (route, path, params), _ in counts.most_common(limit)
+    ]
+
+def _suggestion_prefixes(query, min_length):
+    """Prefixes a user types on the way to `query`, ending with the query itself."""
+    return [query[:length] for length in range(min(min_length, len(query)), len(query) + 1)]
+
+def warm_up(app):
+    """
+    Warm Elasticsearch and the application before taking traffic.
+
+    1. Builds global ordinals for the `tags` and `id` keyword fields
+    2. Compiles the distance scoring script with a synthetic search
+    3. Replays the `WARMUP_TOP_N` most frequent captured requests, and the
+       prefixes typed on the way to each captured suggestion query
+
+    Failures are logged and never stop the worker from starting. Sets
+    `app.warmed_up` once finished.
+    """
+    start_time = time.time()
+    warmed = set()
+    try:
+        with app.app_context():
+            es = app.elasticsearch
+            index_name = os.getenv('ELASTICSEARCH_INDEX', 'items')
+            try:
+                es.search(index=index_name, size=0, aggs={
+                    "tags": {"terms": {"field": "tags", "size": 1}},
+                    "id": {"terms": {"field": "id", "size": 1}}
+                })
+            except Exception as e:
+                app.logger.warning(f"Warm-up could not load global ordinals: {str(e)}")
+
+            # Any search compiles the scoring script; the query needn't match anything
+            search_items('warmup', '00000', 1)
+
+            min_prefix = int(os.getenv('WARMUP_MIN_PREFIX_LENGTH', 2))
+            for route, path, params in top_captured_requests(int(os.getenv('WARMUP_TOP_N', 20))):
+                if route == 'suggestions' and params.get('query') and params.get('zipcode'):
+                    for prefix in _suggestion_prefixes(params['query'], min_prefix):
+                        if ('suggestions', prefix, params['zipcode']) not in warmed:
+                            warmed.add(('suggestions', prefix, params['zipcode']))
+                            search_items(prefix, params['zipcode'], 10)
+                elif route == 'items' and path not in warmed:
+                    warmed.add(path)
+                    get_item(path.rsplit('/', 1)[-1])
+    except Exception as e:
+        app.logger.warning(f"Warm-up stopped early: {str(e)}")
+    finally:
+        app.warmed_up.set()
+
+    app.logger.info(f"Warm-up finished in {round((time.time() - start_time) * 1000)}ms ({len(warmed)} requests replayed)")
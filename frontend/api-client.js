@@ -60,70 +60,168 @@ function renderItems(items) {
   `).join('');
 }
 
-// Main function to handle search
-async function handleSearch(query, zipcode) {
-  const startTime = performance.now();
+// Client-side tuning for the suggestions endpoint
+const DEBOUNCE_MS = 250;      // Wait this long after the last keystroke before requesting
+const CACHE_TTL_MS = 60000;   // How long a cached response may be reused
+const CACHE_MAX_ENTRIES = 100;
+
+// Responses by `${zipcode}|${query}`; Map keeps insertion order, so the first key is the oldest
+const responseCache = new Map();
+
+// Pending debounce timer and in-flight request, so newer keystrokes can supersede them
+let debounceTimer = null;
+let resolvePending = null;
+let inFlight = null;
+
+function normalizeQuery(query) {
+  return (query || '').trim().replace(/\s+/g, ' ').toLowerCase();
+}
+
+function cacheGet(key) {
+  const entry = responseCache.get(key);
+  if (!entry) return null;
+  if (Date.now() - entry.storedAt > CACHE_TTL_MS) {
+    responseCache.delete(key);
+    return null;
+  }
+  return entry.data;
+}
+
+function cacheSet(key, data) {
+  responseCache.delete(key);
+  responseCache.set(key, { data, storedAt: Date.now() });
+  if (responseCache.size > CACHE_MAX_ENTRIES) {
+    responseCache.delete(responseCache.keys().next().value);
+  }
+}
+
+/**
+ * Answer a query from the cache without a request, if possible.
+ *
+ * Only exact repeats are served from the cache. Results for a longer query
+ * are not a subset of a shorter one's (descriptions and tags match whole
+ * words, and fuzzy matching depends on the hit count), so they can't be
+ * derived by filtering.
+ */
+function lookupCache(query, zipcode) {
+  return cacheGet(`${zipcode}|${query}`);
+}
+
+// Fetch suggestions, aborting whichever request is still in flight
+async function fetchSuggestions(query, zipcode) {
   const { baseUrl, apiToken } = getApiConfig();
-  
+
+  if (inFlight) inFlight.abort();
+  const controller = new AbortController();
+  inFlight = controller;
+
+  // Prepare request URL with query parameters
+  const url = new URL(`${baseUrl}/api/v1/suggestions`);
+  if (query) url.searchParams.append('query', query);
+  if (zipcode) url.searchParams.append('zipcode', zipcode);
+
+  // Prepare request headers
+  const headers = {
+    'Accept': 'application/json'
+  };
+
+  // Add API token if available
+  if (apiToken) {
+    headers['X-API-Token'] = apiToken;
+  }
+
   try {
-    // Prepare request URL with query parameters
-    const url = new URL(`${baseUrl}/api/v1/suggestions`);
-    
-    // Add query parameters
-    if (query) url.searchParams.append('query', query);
-    if (zipcode) url.searchParams.append('zipcode', zipcode);
-    
-    // Prepare request headers
-    const headers = {
-      'Accept': 'application/json'
-    };
-    
-    // Add API token if available
-    if (apiToken) {
-      headers['X-API-Token'] = apiToken;
-    }
-    
-    console.log('Making API request to:', url.toString());
-    console.log('With headers:', headers);
-    
-    // Make the API request (GET instead of POST)
     const response = await fetch(url, {
       method: 'GET',
       headers: headers,
       mode: 'cors',
-      credentials: 'same-origin'
+      credentials: 'same-origin',
+      signal: controller.signal
     });
-    
+
     // Check if response is ok
     if (!response.ok) {
       throw new Error(`API returned ${response.status}: ${response.statusText}`);
     }
-    
-    // Parse response
-    const data = await response.json();
-    console.log('API response:', data);
-    
+
+    return await response.json();
+  } finally {
+    if (inFlight === controller) inFlight = null;
+  }
+}
+
+// Format a suggestions response for the page
+function formatResult(data, query, zipcode, timeTaken) {
+  return {
+    html: renderItems(data.items || []),
+    meta: {
+      count: data.meta ? data.meta.count : (data.items ? data.items.length : 0),
+      time_ms: data.meta ? data.meta.time_ms : timeTaken,
+      query: data.meta ? data.meta.query : query,
+      zipcode: data.meta ? data.meta.zipcode : zipcode,
+      total: data.meta ? data.meta.total : (data.items ? data.items.length : 0)
+    }
+  };
+}
+
+// Drop the call waiting on its debounce timer and abort the in-flight request;
+// both resolve to null
+function cancel() {
+  clearTimeout(debounceTimer);
+  if (resolvePending) resolvePending(null);
+  resolvePending = null;
+  if (inFlight) inFlight.abort();
+  inFlight = null;
+}
+
+/**
+ * Main function to handle search.
+ *
+ * Calls are debounced: a call made within DEBOUNCE_MS of the next one
+ * resolves to null instead of sending a request, as does a call whose
+ * request is aborted by a newer one or by cancel(). Pass { immediate: true }
+ * to skip the debounce, e.g. when the user presses Enter.
+ */
+async function handleSearch(query, zipcode, options = {}) {
+  // Supersede earlier calls, so a stale response can't overwrite this one
+  cancel();
+
+  if (!options.immediate) {
+    const proceed = await new Promise(resolve => {
+      resolvePending = resolve;
+      debounceTimer = setTimeout(() => resolve(true), DEBOUNCE_MS);
+    });
+    if (!proceed) return null;
+    resolvePending = null;
+  }
+
+  const startTime = performance.now();
+  const normalizedQuery = normalizeQuery(query);
+  const normalizedZipcode = (zipcode || '').trim();
+
+  const cached = lookupCache(normalizedQuery, normalizedZipcode);
+  if (cached) {
+    return formatResult(cached, query, zipcode, 0);
+  }
+
+  try {
+    const data = await fetchSuggestions(normalizedQuery, normalizedZipcode);
+    // Degraded responses come from a cheaper fallback query; don't reuse them
+    if (!(data.meta && data.meta.degraded)) {
+      cacheSet(`${normalizedZipcode}|${normalizedQuery}`, data);
+    }
+
     // Calculate time taken
-    const endTime = performance.now();
-    const timeTaken = Math.round(endTime - startTime);
-    
-    // Return formatted response
-    return {
-      html: renderItems(data.items || []),
-      meta: {
-        count: data.meta ? data.meta.count : (data.items ? data.items.length : 0),
-        time_ms: data.meta ? data.meta.time_ms : timeTaken,
-        query: data.meta ? data.meta.query : query,
-        zipcode: data.meta ? data.meta.zipcode : zipcode,
-        total: data.meta ? data.meta.total : (data.items ? data.items.length : 0)
-      }
-    };
+    const timeTaken = Math.round(performance.now() - startTime);
+    return formatResult(data, query, zipcode, timeTaken);
   } catch (error) {
+    if (error.name === 'AbortError') return null;
     return handleApiError(error);
   }
 }
 
 // Export for use in other files
 window.apiClient = {
-  handleSearch
-}; 
\ No newline at end of file
+  handleSearch,
+  cancel
+};
@@ -1,72 +1,167 @@
 #!/usr/bin/env python3
 """
-Simple HTTP server for the frontend files.
-This is just for development and testing purposes.
+Threaded HTTP server for the frontend files.
+
+Static assets are loaded, compressed and fingerprinted once at startup, then
+served from memory with ETags and gzip/brotli encoding. The .env file is also
+read once at startup, so restart the server after editing it.
 """
 
 import http.server
-import socketserver
+import gzip
+import hashlib
+import mimetypes
 import os
-import json
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
 
 PORT = 8080
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
+# File types worth compressing; everything else is served as-is
+COMPRESSIBLE_EXTENSIONS = {'.html', '.js', '.css', '.json', '.svg', '.txt'}
+
+class Asset:
+    """A static file held in memory with its precompressed variants."""
+
+    def __init__(self, content, content_type):
+        self.content_type = content_type
+        self.variants = {'identity': content}
+        self.variants['gzip'] = gzip.compress(content, compresslevel=9)
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(content, quality=11)
+
+        # Each content coding is its own representation, so each gets its own ETag
+        digest = hashlib.sha1(content).hexdigest()
+        self.etags = {
+            name: f'"{digest}"' if name == 'identity' else f'"{digest}-{name}"'
+            for name in self.variants
+        }
+
+    def choose(self, accept_encoding):
+        """Pick the smallest variant the client accepts, skipping codings refused with q=0."""
+        accepted = set()
+        for part in accept_encoding.split(','):
+            name, _, params = part.partition(';')
+            quality = 1.0
+            for param in params.split(';'):
+                key, _, value = param.partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(name.strip().lower())
+        candidates = [name for name in ('br', 'gzip') if name in accepted and name in self.variants]
+        if not candidates:
+            return 'identity', self.variants['identity']
+        name = min(candidates, key=lambda name: len(self.variants[name]))
+        return name, self.variants[name]
+
+def load_assets(directory):
+    """Load every compressible file under `directory`, keyed by URL path."""
+    assets = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
+        for filename in files:
+            extension = os.path.splitext(filename)[1]
+            if extension not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(root, filename)
+            url_path = '/' + os.path.relpath(path, directory).replace(os.sep, '/')
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            with open(path, 'rb') as f:
+                assets[url_path] = Asset(f.read(), content_type)
+
+    if '/index.html' in assets:
+        assets['/'] = assets['/index.html']
+    return assets
+
+def load_env_file(directory):
+    """Contents of .env, falling back to .env.example, or None if neither exists."""
+    for name in ('.env', '.env.example'):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+    return None
+
+ASSETS = load_assets(DIRECTORY)
+ENV_CONTENT = load_env_file(DIRECTORY)
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
-    
+
     def end_headers(self):
         # Add CORS headers for local development
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'X-Requested-With, Content-Type, Accept, X-API-Token')
         super().end_headers()
-    
+
     def do_OPTIONS(self):
         # Handle OPTIONS requests for CORS preflight
         self.send_response(200)
         self.end_headers()
-    
+
     def do_GET(self):
-        # Special handling for .env file
-        if self.path == '/.env':
-            # Check if .env file exists
-            env_path = os.path.join(DIRECTORY, '.env')
-            if os.path.exists(env_path):
-                self.send_response(200)
-                self.send_header('Content-type', 'text/plain')
+        path = self.path.split('?', 1)[0]
+
+        # Special handling for .env file, loaded once at startup
+        if path == '/.env':
+            if ENV_CONTENT is None:
+                self.send_response(404)
                 self.end_headers()
-                
-                # Read and send the .env file
-                with open(env_path, 'rb') as f:
-                    self.wfile.write(f.read())
-            else:
-                # If .env doesn't exist, try to use .env.example
-                example_path = os.path.join(DIRECTORY, '.env.example')
-                if os.path.exists(example_path):
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/plain')
-                    self.end_headers()
-                    
-                    # Read and send the .env.example file
-                    with open(example_path, 'rb') as f:
-                        self.wfile.write(f.read())
-                else:
-                    # If neither exists, return 404
-                    self.send_response(404)
-                    self.end_headers()
-                    self.wfile.write(b'Environment file not found')
-        else:
+                self.wfile.write(b'Environment file not found')
+                return
+            self.send_response(200)
+            self.send_header('Content-type', 'text/plain')
+            self.send_header('Content-Length', str(len(ENV_CONTENT)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(ENV_CONTENT)
+            return
+
+        asset = ASSETS.get(path)
+        if asset is None:
             # Handle all other requests normally
             super().do_GET()
+            return
+
+        encoding, body = asset.choose(self.headers.get('Accept-Encoding', ''))
+        etag = asset.etags[encoding]
+
+        if_none_match = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        if etag in if_none_match or '*' in if_none_match:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
 
 if __name__ == "__main__":
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
-        print(f"Serving at http://localhost:{PORT}")
+    with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
+        print(f"Serving {len(ASSETS)} assets at http://localhost:{PORT}")
         print(f"To use the application, create a .env file with your API token")
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nServer stopped.")
-            httpd.server_close() 
\ No newline at end of file
+            httpd.server_close()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Script to replay captured queries against the API and compare latency runs.
+
+Requests are captured by the service when QUERY_CAPTURE_FILE is set. Replaying
+a capture keeps the original arrival pattern, optionally sped up, and writes
+the client-side latency of every request to a results file. Two results files
+can then be compared to check a change against real traffic before deploying.
+
+Usage:
+    python scripts/replay_queries.py replay captures.jsonl --output baseline.jsonl
+    python scripts/replay_queries.py replay captures.jsonl --speedup 4 --base-url http://staging:5001 --output candidate.jsonl
+    python scripts/replay_queries.py compare baseline.jsonl candidate.jsonl
+"""
+
+import argparse
+import json
+import math
+import requests
+from requests.adapters import HTTPAdapter
+import os
+from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+import time
+
+# Load environment variables
+load_dotenv()
+
+def load_records(paths):
+    """Load JSON-lines records from one or more files, ordered by capture time."""
+    records = []
+    for path in paths:
+        with open(path, 'r') as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return sorted(records, key=lambda record: record.get('ts', 0))
+
+def replay_request(session, record, api_token, base_url):
+    """Replay a single captured request and time it."""
+    start_time = time.perf_counter()
+    try:
+        response = session.get(
+            f"{base_url}{record['path']}",
+            params=record['params'],
+            headers={'X-API-Token': api_token}
+        )
+        status = response.status_code
+    except requests.RequestException:
+        status = None
+
+    return {
+        'route': record['route'],
+        'path': record['path'],
+        'params': record['params'],
+        'status': status,
+        'time_ms': round((time.perf_counter() - start_time) * 1000, 2)
+    }
+
+def replay(args):
+    """Replay a capture, keeping its arrival pattern scaled by the speedup."""
+    api_token = os.getenv('API_TOKEN')
+    if not api_token:
+        print("Error: API_TOKEN not found in environment variables")
+        return
+
+    records = load_records(args.captures)
+    if not records:
+        print("Error: no captured requests found")
+        return
+
+    pace = f"{args.speedup}x" if args.speedup > 0 else "full speed"
+    print(f"Replaying {len(records)} requests against {args.base_url} at {pace}")
+    session = requests.Session()
+    # One pooled connection per worker thread, so no request waits on or opens extra connections
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=args.concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    first_ts = records[0]['ts']
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = []
+        for record in records:
+            # Wait until the request's (scaled) offset in the original capture
+            if args.speedup > 0:
+                delay = (record['ts'] - first_ts) / args.speedup - (time.perf_counter() - start_time)
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(executor.submit(replay_request, session, record, api_token, args.base_url))
+
+        results = [future.result() for future in tqdm(futures, desc="Waiting for responses")]
+
+    with open(args.output, 'w') as f:
+        for result in results:
+            f.write(json.dumps(result) + '\n')
+
+    failed = len([r for r in results if r['status'] != 200])
+    print(f"\nReplay completed in {time.perf_counter() - start_time:.1f}s")
+    print(f"- Results written to {args.output}")
+    print(f"- Non-200 responses: {failed}/{len(results)}")
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list."""
+    index = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+def summarize(results):
+    """Latency distribution of the successful requests in a run."""
+    times = sorted(r['time_ms'] for r in results if r['status'] == 200)
+    if not times:
+        return None
+    return {
+        'count': len(times),
+        'errors': len(results) - len(times),
+        'mean': sum(times) / len(times),
+        'p50': percentile(times, 50),
+        'p90': percentile(times, 90),
+        'p99': percentile(times, 99),
+        'max': times[-1]
+    }
+
+def compare(args):
+    """Print the latency distributions of two runs side by side, per route."""
+    baseline = load_records([args.baseline])
+    candidate = load_records([args.candidate])
+    routes = sorted({r['route'] for r in baseline} | {r['route'] for r in candidate})
+
+    for route in ['all'] + routes:
+        before = summarize([r for r in baseline if route == 'all' or r['route'] == route])
+        after = summarize([r for r in candidate if route == 'all' or r['route'] == route])
+        print(f"\n{route}")
+        if before is None or after is None:
+            print("  not enough successful requests in both runs")
+            continue
+
+        print(f"  {'':8}{'baseline':>12}{'candidate':>12}{'change':>10}")
+        for key in ['count', 'errors']:
+            print(f"  {key:8}{before[key]:>12}{after[key]:>12}")
+        for key in ['mean', 'p50', 'p90', 'p99', 'max']:
+            change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            print(f"  {key:8}{before[key]:>10.1f}ms{after[key]:>10.1f}ms{change:>+9.1f}%")
+
+def main():
+    """Main function to parse arguments and run a command."""
+    parser = argparse.ArgumentParser(description="Replay captured queries and compare latency runs.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = commands.add_parser('replay', help="Replay captured requests against an API")
+    replay_parser.add_argument('captures', nargs='+', help="Capture files (rotated files can be listed together)")
+    replay_parser.add_argument('--output', required=True, help="File to write the replay results to")
+    replay_parser.add_argument('--base-url', default=os.getenv('API_URL', 'http://localhost:5001'))
+    replay_parser.add_argument('--speedup', type=float, default=1.0,
+                               help="Replay this many times faster than captured; 0 sends as fast as possible")
+    replay_parser.add_argument('--concurrency', type=int, default=16, help="Maximum requests in flight")
+    replay_parser.set_defaults(func=replay)
+
+    compare_parser = commands.add_parser('compare', help="Compare the latency of two replay runs")
+    compare_parser.add_argument('baseline', help="Results file of the reference run")
+    compare_parser.add_argument('candidate', help="Results file of the run to check")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -10,4 +10,7 @@ setup(
         "python-dotenv",
         "flask-cors",
     ],
+    extras_require={
+        "brotli": ["brotli"],
+    },
 ) 
\ No newline at end of file
@@ -0,0 +1,78 @@
+import json
+import os
+import pytest
+from flask import Flask, jsonify
+from werkzeug.datastructures import MultiDict
+from app.middleware import capture
+from app.middleware.capture import capture_queries, normalize_params
+
+@pytest.fixture
+def capture_app(tmp_path, monkeypatch):
+    """A minimal app with one captured route, writing to a temporary file."""
+    monkeypatch.setenv('QUERY_CAPTURE_FILE', str(tmp_path / 'queries-{pid}.jsonl'))
+    capture.reset_capture()
+
+    app = Flask(__name__)
+
+    @app.route('/search')
+    @capture_queries('suggestions')
+    def search():
+        return jsonify({"items": []}), 200
+
+    yield app
+    capture.reset_capture()
+
+def read_records(tmp_path):
+    capture_file = tmp_path / f'queries-{os.getpid()}.jsonl'
+    if not capture_file.exists():
+        return []
+    return [json.loads(line) for line in capture_file.read_text().splitlines()]
+
+def test_normalize_params_collapses_query():
+    """Test that case and whitespace differences in the query are normalized away."""
+    params = normalize_params(MultiDict({'query': '  Family   Bookstore ', 'zipcode': ' 10001'}))
+    assert params == {'query': 'family bookstore', 'zipcode': '10001'}
+
+def test_normalize_params_without_query():
+    """Test that requests without a query keep their other parameters."""
+    assert normalize_params(MultiDict({'zipcode': '10001'})) == {'zipcode': '10001'}
+
+def test_capture_writes_record(capture_app, tmp_path, monkeypatch):
+    """Test that a sampled request is written to the per-process file with all fields."""
+    monkeypatch.setenv('QUERY_CAPTURE_SAMPLE_RATE', '1')
+    response = capture_app.test_client().get('/search?query=Book%20%20Store&zipcode=10001')
+    assert response.status_code == 200
+
+    records = read_records(tmp_path)
+    assert len(records) == 1
+    record = records[0]
+    assert record['route'] == 'suggestions'
+    assert record['path'] == '/search'
+    assert record['params'] == {'query': 'book store', 'zipcode': '10001'}
+    assert record['status'] == 200
+    assert record['time_ms'] >= 0
+    assert 'ts' in record
+
+def test_capture_respects_sample_rate(capture_app, tmp_path, monkeypatch):
+    """Test that requests outside the sample are not recorded."""
+    monkeypatch.setenv('QUERY_CAPTURE_SAMPLE_RATE', '0')
+    client = capture_app.test_client()
+    for _ in range(5):
+        client.get('/search?query=cafe&zipcode=10001')
+    assert read_records(tmp_path) == []
+
+def test_capture_default_sample_rate(capture_app, tmp_path, monkeypatch):
+    """Test that the default sample rate records about one request in ten."""
+    monkeypatch.delenv('QUERY_CAPTURE_SAMPLE_RATE', raising=False)
+    values = iter([0.05, 0.5, 0.95, 0.099, 0.1])
+    monkeypatch.setattr(capture.random, 'random', lambda: next(values))
+    client = capture_app.test_client()
+    for _ in range(5):
+        client.get('/search?query=cafe&zipcode=10001')
+    assert len(read_records(tmp_path)) == 2
+
+def test_capture_off_without_file(monkeypatch):
+    """Test that nothing is captured unless QUERY_CAPTURE_FILE is set."""
+    monkeypatch.delenv('QUERY_CAPTURE_FILE', raising=False)
+    capture.reset_capture()
+    assert capture._get_capture_logger() is None
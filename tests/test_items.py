@@ -1,3 +1,4 @@
+import gzip
 import json
 import pytest
 from flask import current_app
@@ -44,6 +45,42 @@ def test_get_item(client, auth_headers, sample_item):
     assert data['tags'] == sample_item['tags']
     assert data['suggest_input'] == sample_item['suggest_input']
 
+def test_get_item_not_modified(client, auth_headers, sample_item):
+    """Test that a matching If-None-Match returns 304 without a body."""
+    client.put(
+        '/api/v1/items',
+        data=json.dumps(sample_item),
+        headers=auth_headers
+    )
+
+    response = client.get(
+        f'/api/v1/items/{sample_item["id"]}',
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert 'Cache-Control' in response.headers
+
+    response = client.get(
+        f'/api/v1/items/{sample_item["id"]}',
+        headers={**auth_headers, 'If-None-Match': etag}
+    )
+    assert response.status_code == 304
+    assert response.data == b''
+
+    # Re-indexing the item creates a new version with a new ETag
+    client.put(
+        '/api/v1/items',
+        data=json.dumps(sample_item),
+        headers=auth_headers
+    )
+    response = client.get(
+        f'/api/v1/items/{sample_item["id"]}',
+        headers={**auth_headers, 'If-None-Match': etag}
+    )
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
 def test_get_nonexistent_item(client, auth_headers):
     """Test retrieving an item that doesn't exist."""
     response = client.get(
@@ -125,4 +162,68 @@ def test_delete_item(client, auth_headers, sample_item):
     )
     assert get_response.status_code == 404
     get_data = json.loads(get_response.data)
-    assert get_data['error'] == "Item not found" 
\ No newline at end of file
+    assert get_data['error'] == "Item not found" 
+
+def test_item_lifecycle_with_region_routing(client, auth_headers, sample_item, monkeypatch):
+    """Test that routed items can be fetched and deleted without knowing their routing."""
+    monkeypatch.setenv('ROUTING_BY_REGION', 'true')
+    item = sample_item.copy()
+    item['id'] = random.randint(100000, 999999)
+
+    put_response = client.put(
+        '/api/v1/items',
+        data=json.dumps(item),
+        headers=auth_headers
+    )
+    assert put_response.status_code == 200
+
+    get_response = client.get(f'/api/v1/items/{item["id"]}', headers=auth_headers)
+    assert get_response.status_code == 200
+    assert json.loads(get_response.data)['name'] == item['name']
+
+    del_response = client.delete(f'/api/v1/items/{item["id"]}', headers=auth_headers)
+    assert del_response.status_code == 200
+
+    get_response = client.get(f'/api/v1/items/{item["id"]}', headers=auth_headers)
+    assert get_response.status_code == 404
+
+def test_create_item_null_metadata_with_region_routing(client, auth_headers, sample_item, monkeypatch):
+    """Test that a null metadata object is accepted when routing by region."""
+    monkeypatch.setenv('ROUTING_BY_REGION', 'true')
+    item = sample_item.copy()
+    item['id'] = random.randint(100000, 999999)
+    item['metadata'] = None
+
+    response = client.put(
+        '/api/v1/items',
+        data=json.dumps(item),
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    client.delete(f'/api/v1/items/{item["id"]}', headers=auth_headers)
+
+def test_export_items(client, auth_headers, sample_item):
+    """Test streaming the whole index as NDJSON."""
+    client.put(
+        '/api/v1/items',
+        data=json.dumps(sample_item),
+        headers=auth_headers
+    )
+
+    response = client.get('/api/v1/items/_export', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    items = [json.loads(line) for line in response.data.splitlines()]
+    assert str(sample_item['id']) in {item['id'] for item in items}
+
+def test_export_items_gzip(client, auth_headers):
+    """Test that the export stream is gzipped when the client accepts it."""
+    response = client.get(
+        '/api/v1/items/_export',
+        headers={**auth_headers, 'Accept-Encoding': 'gzip'}
+    )
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(response.data).splitlines()
+    assert all(json.loads(line) for line in lines)
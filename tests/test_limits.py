@@ -0,0 +1,91 @@
+import json
+import pytest
+from app.middleware import limits
+from app.middleware.limits import TokenBucket, reset_limits
+
+@pytest.fixture(autouse=True)
+def fresh_limits():
+    """Make every test start with empty limiter state."""
+    reset_limits()
+    yield
+    reset_limits()
+
+def test_token_bucket_allows_burst():
+    """Test that a full bucket admits up to its capacity at once."""
+    bucket = TokenBucket(rate=1, capacity=3)
+    assert [bucket.consume() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+def test_token_bucket_reports_wait_when_empty():
+    """Test that an empty bucket returns how long to wait for the next token."""
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.consume() == 0.0
+    wait = bucket.consume()
+    assert 0 < wait <= 0.5
+
+def test_suggestions_rate_limited(client, auth_headers, monkeypatch):
+    """Test that requests over the per-token rate get 429 with Retry-After."""
+    monkeypatch.setenv('RATE_LIMIT_PER_SECOND_SUGGESTIONS', '0.01')
+    monkeypatch.setenv('RATE_LIMIT_BURST_SUGGESTIONS', '1')
+
+    # Missing parameters keep the admitted request away from Elasticsearch
+    response = client.get('/api/v1/suggestions?zipcode=10001', headers=auth_headers)
+    assert response.status_code == 400
+
+    response = client.get('/api/v1/suggestions?zipcode=10001', headers=auth_headers)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    data = json.loads(response.data)
+    assert data['error'] == 'Too Many Requests'
+
+def test_suggestions_shed_when_fallback_full(client, auth_headers, monkeypatch):
+    """Test that overflow gets 503 once both the search and its fallback are at capacity."""
+    monkeypatch.setenv('MAX_CONCURRENT_BACKEND_CALLS_SUGGESTIONS', '1')
+    monkeypatch.setenv('MAX_CONCURRENT_BACKEND_CALLS_SUGGESTIONS_FALLBACK', '1')
+    monkeypatch.setenv('ADMISSION_QUEUE_TIMEOUT', '0')
+
+    # Occupy every slot as concurrent requests would
+    search_slot = limits._get_semaphore('suggestions')
+    fallback_slot = limits._get_semaphore('suggestions_fallback')
+    search_slot.acquire()
+    fallback_slot.acquire()
+    try:
+        response = client.get('/api/v1/suggestions?query=book&zipcode=10001', headers=auth_headers)
+        assert response.status_code == 503
+        assert int(response.headers['Retry-After']) >= 1
+    finally:
+        search_slot.release()
+        fallback_slot.release()
+
+def test_export_holds_slot_while_streaming(client, auth_headers, monkeypatch):
+    """Test that an open export stream keeps its slot, so a second export gets 503."""
+    monkeypatch.setenv('MAX_CONCURRENT_BACKEND_CALLS_EXPORT', '1')
+    monkeypatch.setenv('ADMISSION_QUEUE_TIMEOUT', '0')
+
+    first = client.get('/api/v1/items/_export', headers=auth_headers)
+    assert first.status_code == 200
+
+    second = client.get('/api/v1/items/_export', headers=auth_headers)
+    assert second.status_code == 503
+    assert int(second.headers['Retry-After']) >= 1
+
+    # Closing the stream frees the slot
+    first.close()
+    third = client.get('/api/v1/items/_export', headers=auth_headers)
+    assert third.status_code == 200
+    third.close()
+
+def test_suggestions_degraded_when_search_full(client, auth_headers, monkeypatch):
+    """Test that suggestions are served by the fallback, marked degraded, when the search is full."""
+    monkeypatch.setenv('MAX_CONCURRENT_BACKEND_CALLS_SUGGESTIONS', '1')
+    monkeypatch.setenv('ADMISSION_QUEUE_TIMEOUT', '0')
+
+    search_slot = limits._get_semaphore('suggestions')
+    search_slot.acquire()
+    try:
+        response = client.get('/api/v1/suggestions?query=book&zipcode=10001', headers=auth_headers)
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['meta']['degraded'] is True
+        assert 'items' in data
+    finally:
+        search_slot.release()
@@ -0,0 +1,57 @@
+import importlib.util
+import json
+import os
+import pytest
+
+@pytest.fixture(scope='module')
+def replay():
+    """Load scripts/replay_queries.py, which is not part of a package."""
+    path = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'replay_queries.py')
+    spec = importlib.util.spec_from_file_location('replay_queries', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_percentile_nearest_rank(replay):
+    """Test nearest-rank percentiles, including the half-way ranks."""
+    values = [1, 2, 3, 4, 5]
+    assert replay.percentile(values, 50) == 3
+    assert replay.percentile(values, 90) == 5
+    assert replay.percentile(values, 99) == 5
+    assert replay.percentile(list(range(1, 11)), 90) == 9
+    assert replay.percentile([7], 50) == 7
+
+def test_summarize_ignores_failures(replay):
+    """Test that only successful requests count towards latency, failures as errors."""
+    results = [{'status': 200, 'time_ms': t} for t in [10, 20, 30, 40]]
+    results.append({'status': 500, 'time_ms': 1})
+    summary = replay.summarize(results)
+    assert summary['count'] == 4
+    assert summary['errors'] == 1
+    assert summary['mean'] == 25
+    assert summary['p50'] == 20
+    assert summary['max'] == 40
+
+def test_summarize_without_successes(replay):
+    """Test that a run without successful requests has no summary."""
+    assert replay.summarize([{'status': None, 'time_ms': 5}]) is None
+
+def test_compare_reports_routes(replay, tmp_path, capsys):
+    """Test that compare prints every route and the change between runs."""
+    def write(name, times):
+        path = tmp_path / name
+        path.write_text(''.join(
+            json.dumps({'route': route, 'status': 200, 'time_ms': t}) + '\n'
+            for route, t in times
+        ))
+        return str(path)
+
+    baseline = write('baseline.jsonl', [('suggestions', 10), ('items', 20)])
+    candidate = write('candidate.jsonl', [('suggestions', 5), ('items', 20)])
+    replay.compare(type('Args', (), {'baseline': baseline, 'candidate': candidate}))
+
+    output = capsys.readouterr().out
+    assert '\nall\n' in output
+    assert '\nitems\n' in output
+    assert '\nsuggestions\n' in output
+    assert '-50.0%' in output
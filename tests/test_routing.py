@@ -0,0 +1,18 @@
+from app.controllers.items import _search_routing
+
+def test_search_routing_covers_neighbors(monkeypatch):
+    """Test that a full zipcode routes to its region, its neighbors and region 000."""
+    monkeypatch.setenv('ROUTING_BY_REGION', 'true')
+    monkeypatch.setenv('ROUTING_NEIGHBOR_REGIONS', '1')
+    assert _search_routing('10001') == '099,100,101,000'
+
+def test_search_routing_partial_zipcode(monkeypatch):
+    """Test that partial or malformed zipcodes search every shard."""
+    monkeypatch.setenv('ROUTING_BY_REGION', 'true')
+    for zipcode in ['1', '12', '123', '1000a', '100012']:
+        assert _search_routing(zipcode) is None
+
+def test_search_routing_disabled(monkeypatch):
+    """Test that routing is off unless enabled."""
+    monkeypatch.delenv('ROUTING_BY_REGION', raising=False)
+    assert _search_routing('10001') is None
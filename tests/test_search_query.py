@@ -0,0 +1,52 @@
+import copy
+import pytest
+from flask import Flask
+from app.controllers.items import search_items
+
+class RecordingElasticsearch:
+    """Stand-in client that records each search body and reports a fixed hit count."""
+
+    def __init__(self, total):
+        self.total = total
+        self.bodies = []
+
+    def search(self, index, body, routing=None):
+        self.bodies.append(copy.deepcopy(body))
+        return {"hits": {"total": {"value": self.total}, "hits": []}}
+
+def fuzzy_clauses(body):
+    should = body['query']['function_score']['query']['bool']['should']
+    return [clause for clause in should if 'fuzziness' in clause.get('match', {}).get('name', {})]
+
+@pytest.fixture
+def search(monkeypatch):
+    """Run search_items against a recording client with FUZZY_FALLBACK_MIN_HITS=3."""
+    monkeypatch.setenv('FUZZY_FALLBACK_MIN_HITS', '3')
+    monkeypatch.delenv('ROUTING_BY_REGION', raising=False)
+    app = Flask(__name__)
+
+    def run(total, size=20):
+        app.elasticsearch = RecordingElasticsearch(total)
+        with app.app_context():
+            response, status = search_items('bookstor', '10001', size)
+        assert status == 200
+        return app.elasticsearch.bodies
+    return run
+
+def test_no_fuzzy_clause_with_enough_hits(search):
+    """Test that a single query without fuzziness is sent when prefixes find enough items."""
+    bodies = search(total=3)
+    assert len(bodies) == 1
+    assert fuzzy_clauses(bodies[0]) == []
+
+def test_fuzzy_clause_below_min_hits(search):
+    """Test that the fuzzy name clause is added in a second query when too few items match."""
+    bodies = search(total=2)
+    assert len(bodies) == 2
+    assert fuzzy_clauses(bodies[0]) == []
+    assert len(fuzzy_clauses(bodies[1])) == 1
+
+def test_fuzzy_threshold_capped_by_size(search):
+    """Test that a full page of results never triggers the fuzzy query."""
+    bodies = search(total=1, size=1)
+    assert len(bodies) == 1
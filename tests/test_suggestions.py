@@ -24,6 +24,30 @@ def test_suggestions_basic_search(client, auth_headers):
     assert isinstance(data['meta']['count'], int)
     assert isinstance(data['meta']['total'], int)
 
+def test_suggestions_prefix_search(client, auth_headers):
+    """Test that a partially typed word matches through the prefix subfields."""
+    response = client.get(
+        '/api/v1/suggestions?query=books&zipcode=10001',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['meta']['count'] > 0
+    assert any('bookstore' in item['name'].lower() for item in data['items'])
+
+def test_suggestions_not_modified(client, auth_headers):
+    """Test that repeating a suggestions request with its ETag returns 304."""
+    url = '/api/v1/suggestions?query=bookstore&zipcode=10001'
+
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
 def test_suggestions_missing_parameters(client, auth_headers):
     """Test suggestions with missing required parameters."""
     # Test missing query
@@ -0,0 +1,50 @@
+import json
+from app import warmup
+from app.warmup import top_captured_requests, _suggestion_prefixes
+
+def test_suggestion_prefixes():
+    """Test that warm-up covers every prefix typed on the way to a query."""
+    assert _suggestion_prefixes('cafe', 2) == ['ca', 'caf', 'cafe']
+    assert _suggestion_prefixes('a', 2) == ['a']
+
+def test_top_captured_requests(tmp_path, monkeypatch):
+    """Test that captured requests are ranked by frequency, skipping failures."""
+    capture_file = tmp_path / 'queries-123.jsonl'
+    records = [
+        {"route": "suggestions", "path": "/api/v1/suggestions", "params": {"query": "cafe", "zipcode": "10001"}, "status": 200},
+        {"route": "suggestions", "path": "/api/v1/suggestions", "params": {"query": "cafe", "zipcode": "10001"}, "status": 200},
+        {"route": "items", "path": "/api/v1/items/1", "params": {}, "status": 200},
+        {"route": "items", "path": "/api/v1/items/2", "params": {}, "status": 404},
+    ]
+    capture_file.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    monkeypatch.setenv('QUERY_CAPTURE_FILE', str(tmp_path / 'queries-{pid}.jsonl'))
+
+    assert top_captured_requests(10) == [
+        ("suggestions", "/api/v1/suggestions", {"query": "cafe", "zipcode": "10001"}),
+        ("items", "/api/v1/items/1", {}),
+    ]
+
+def test_ready_after_warmup(client):
+    """Test that the readiness route reports ready once warm-up is done."""
+    response = client.get('/api/ready')
+    assert response.status_code == 200
+    assert json.loads(response.data)['status'] == 'Ready'
+
+def test_top_captured_requests_skips_bad_records(tmp_path, monkeypatch):
+    """Test that malformed capture lines are skipped instead of failing warm-up."""
+    capture_file = tmp_path / 'queries-123.jsonl'
+    record = {"route": "items", "path": "/api/v1/items/1", "params": {}, "status": 200}
+    capture_file.write_text('[1,2]\n{not json\n{"status": 200, "params": []}\n' + json.dumps(record) + '\n')
+    monkeypatch.setenv('QUERY_CAPTURE_FILE', str(tmp_path / 'queries-{pid}.jsonl'))
+
+    assert top_captured_requests(10) == [("items", "/api/v1/items/1", {})]
+
+def test_warm_up_reports_ready_after_failure(app, monkeypatch):
+    """Test that a failing warm-up still marks the worker ready."""
+    def fail(limit):
+        raise OSError("capture file rotated away")
+
+    monkeypatch.setattr(warmup, 'top_captured_requests', fail)
+    app.warmed_up.clear()
+    warmup.warm_up(app)
+    assert app.warmed_up.is_set()